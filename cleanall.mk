@@ -3,4 +3,5 @@ cleanall: check clean
 	@rm -rf results.xml
 	@rm -rf log.txt
 	@rm -rf sim_build
+	@rm -rf .regress_cache
 
@@ -13,18 +13,31 @@ module pm32 (
     input  logic [31:0]   mc,
     input  logic [31:0]   mp,
     output logic [63:0]   p,
+    output logic [15:0]   p_hi, // upper accumulator bits, valid after OP_ACC
     output logic          done,
-    input  logic          op // not use for in design, but added for compatibility with tb
+    input  logic [2:0]    op
 );
-    logic        pw;
-    logic [31:0] Y;
-    logic [7:0]  cnt, ncnt;
+    // op encoding, sampled with start (0 behaves as OP_MUL)
+    localparam logic [2:0] OP_MUL  = 3'd1;  // p = mc * mp
+    localparam logic [2:0] OP_MAC  = 3'd2;  // p = mc * mp, acc += p
+    localparam logic [2:0] OP_ACC  = 3'd3;  // {p_hi, p} = acc, acc = 0
+    localparam logic [2:0] OP_MUL2 = 3'd4;  // 2 x 16-bit lanes, p[32i+:32] = mc[16i+:16] * mp[16i+:16]
+    localparam logic [2:0] OP_MUL4 = 3'd5;  // 4 x 8-bit lanes, p[16i+:16] = mc[8i+:8] * mp[8i+:8]
+
+    logic [31:0] pw;
+    logic [31:0] Y, Yn;
+    logic [31:0] yv, brk;
+    logic [7:0]  cnt, ncnt, last;
     logic [1:0]  state, nstate;
+    logic [2:0]  opr;
+    logic [79:0] acc;
+    logic [63:0] pn;
 
     typedef enum logic [1:0] {
         IDLE    = 2'b00,
         RUNNING = 2'b01,
-        DONE    = 2'b10
+        DONE    = 2'b10,
+        READ    = 2'b11
     } state_t;
 
     always_ff @(posedge clk or posedge rst) begin
@@ -36,9 +49,10 @@ module pm32 (
 
     always_comb begin
         case(state)
-            IDLE    : nstate = start ? RUNNING : IDLE;
-            RUNNING : nstate = (cnt == 64) ? DONE : RUNNING;
-            DONE    : nstate = start ? RUNNING : DONE;
+            IDLE    : nstate = start ? ((op == OP_ACC) ? READ : RUNNING) : IDLE;
+            RUNNING : nstate = (cnt == last) ? DONE : RUNNING;
+            DONE    : nstate = start ? ((op == OP_ACC) ? READ : RUNNING) : DONE;
+            READ    : nstate = DONE;
             default : nstate = IDLE;
         endcase
     end
@@ -59,32 +73,87 @@ module pm32 (
         endcase
     end
 
+    always_ff @(posedge clk or posedge rst) begin
+        if(rst)
+            opr <= '0;
+        else if(start)
+            opr <= op;
+    end
+
+    // Lane partitioning: the multiplier of each lane is shifted out with
+    // sign extension, each lane gets its own multiplier bit, and the product
+    // bits of each lane are shifted into its own segment of p.
+    always_comb begin
+        case(opr)
+            OP_MUL2 : begin
+                last = 8'd32;
+                Yn   = {Y[31], Y[31:17], Y[15], Y[15:1]};
+                yv   = {{16{Y[16]}}, {16{Y[0]}}};
+                brk  = 32'h0000_8000;
+                pn   = {pw[16], p[63:33], pw[0], p[31:1]};
+            end
+            OP_MUL4 : begin
+                last = 8'd16;
+                Yn   = {Y[31], Y[31:25], Y[23], Y[23:17], Y[15], Y[15:9], Y[7], Y[7:1]};
+                yv   = {{8{Y[24]}}, {8{Y[16]}}, {8{Y[8]}}, {8{Y[0]}}};
+                brk  = 32'h0080_8080;
+                pn   = {pw[24], p[63:49], pw[16], p[47:33], pw[8], p[31:17], pw[0], p[15:1]};
+            end
+            default : begin
+                last = 8'd64;
+                Yn   = {Y[31], Y[31:1]};
+                yv   = {32{Y[0]}};
+                brk  = '0;
+                pn   = {pw[0], p[63:1]};
+            end
+        endcase
+    end
+
     always_ff @(posedge clk or posedge rst) begin
         if(rst)
             Y <= '0;
         else if(start)
             Y <= mp;
         else if(state == RUNNING)
-            Y <= Y >> 1;
+            Y <= Yn;
     end
 
     always_ff @(posedge clk or posedge rst) begin
         if(rst)
             p <= '0;
         else if(start)
-            p <= '0;
+            p <= (op == OP_ACC) ? acc[63:0] : '0;
         else if(state == RUNNING)
-            p <= {pw, p[63:1]};
+            p <= pn;
     end
 
-    logic y;
-    assign y = (state == RUNNING) ? Y[0] : 1'b0;
+    always_ff @(posedge clk or posedge rst) begin
+        if(rst)
+            p_hi <= '0;
+        else if(start)
+            p_hi <= (op == OP_ACC) ? acc[79:64] : '0;
+    end
 
-    spm #(.SIZE(32)) spm32(
+    // Accumulate the product on its last shift
+    always_ff @(posedge clk or posedge rst) begin
+        if(rst)
+            acc <= '0;
+        else if(start && op == OP_ACC)
+            acc <= '0;
+        else if(state == RUNNING && cnt == 64 && opr == OP_MAC)
+            acc <= acc + {{16{pn[63]}}, pn};
+    end
+
+    logic [31:0] y;
+    assign y = (state == RUNNING) ? yv : '0;
+
+    spm #(.SIZE(32), .LANE(8)) spm32(
         .clk(clk),
         .rst(rst),
-        .x(mc),
+        .clr(start),
         .y(y),
+        .brk(brk),
+        .x(mc),
         .p(pw)
     );
 
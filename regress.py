@@ -0,0 +1,318 @@
+"""Incremental regression runner for the PM32 testbenches.
+
+Each test is fingerprinted from the RTL, the shared testbench utilities,
+its bench module, the random seed, the simulator, cocotb and pyuvm
+versions and the environment variables that decide verdicts. A test whose
+fingerprint already has a passing verdict in the cache is skipped; all
+other tests are run one at a time through ``make sim``.
+
+Usage:
+    python3 regress.py                  # run only what changed
+    python3 regress.py --force          # run everything
+    python3 regress.py -m testbench2    # restrict to one bench module
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCHES = ("test_my_dut", "testbench2", "testbench")
+# Inputs shared by every test
+COMMON_INPUTS = ("pm32.v", "spm.v", "tb_utils.py", "Makefile", "verilator.vlt")
+# Environment variables that change verdicts, matched by prefix
+VERDICT_ENV = ("PM32_MAX_LATENCY",)
+# Python packages the benches run on
+PACKAGES = ("cocotb", "pyuvm")
+CACHE_DIR = os.path.join(ROOT, ".regress_cache")
+SIM_VERSION_CMDS = {
+    "icarus": ["iverilog", "-V"],
+    "verilator": ["verilator", "--version"],
+}
+TEST_RE = re.compile(
+    r"@(?:cocotb|pyuvm)\.test\(\)\s*\n\s*(?:async\s+def|class)\s+(\w+)")
+
+
+def file_digest(path):
+    """Hash the contents of a file.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: SHA-256 hex digest, or "missing" if the file does not exist
+    """
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+
+
+def sim_version(sim):
+    """Get the version string of a simulator.
+
+    Args:
+        sim (str): Simulator name as used by the cocotb Makefiles
+
+    Returns:
+        str: First line of the simulator version output
+    """
+    cmd = SIM_VERSION_CMDS.get(sim, [sim, "--version"])
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    except OSError:
+        return "unknown"
+    lines = (out.stdout or out.stderr).splitlines()
+    return lines[0].strip() if lines else "unknown"
+
+
+def package_version(name):
+    """Get the installed version of a Python package.
+
+    Args:
+        name (str): Distribution name
+
+    Returns:
+        str: Version string, or "missing" if it is not installed
+    """
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "missing"
+
+
+def tool_versions(sim):
+    """Describe the simulator and bench framework versions.
+
+    Args:
+        sim (str): Simulator name
+
+    Returns:
+        str: Simulator version followed by the package versions
+    """
+    versions = [sim_version(sim)]
+    versions += [f"{name} {package_version(name)}" for name in PACKAGES]
+    return "; ".join(versions)
+
+
+def verdict_env():
+    """Get the environment variables that change verdicts.
+
+    Returns:
+        list: Sorted (name, value) pairs
+    """
+    return sorted((name, value) for name, value in os.environ.items()
+                  if name.startswith(VERDICT_ENV))
+
+
+def discover_tests(module):
+    """Find the tests declared in a bench module.
+
+    Args:
+        module (str): Bench module name
+
+    Returns:
+        list: Test names in declaration order
+    """
+    with open(os.path.join(ROOT, f"{module}.py")) as f:
+        return TEST_RE.findall(f.read())
+
+
+def fingerprint(module, test, seed, sim, version):
+    """Compute the fingerprint of all inputs of one test.
+
+    Args:
+        module (str): Bench module name
+        test (str): Test name
+        seed (str): Random seed
+        sim (str): Simulator name
+        version (str): Simulator and framework versions
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    h = hashlib.sha256()
+    for name in COMMON_INPUTS + (f"{module}.py",):
+        h.update(f"{name}:{file_digest(os.path.join(ROOT, name))}\n".encode())
+    h.update(f"{module}:{test}:{seed}:{sim}:{version}\n".encode())
+    for name, value in verdict_env():
+        h.update(f"{name}={value}\n".encode())
+    return h.hexdigest()
+
+
+def load_cache():
+    """Load the verdict cache.
+
+    Returns:
+        dict: Cache entries keyed by fingerprint
+    """
+    try:
+        with open(os.path.join(CACHE_DIR, "index.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_cache(cache):
+    """Write the verdict cache.
+
+    Args:
+        cache (dict): Cache entries keyed by fingerprint
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, "index.json"), "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def prune_cache(cache, key):
+    """Drop older entries for the same test as a new entry.
+
+    Removes every other entry with the same module, test and simulator as
+    cache[key], together with its results and coverage files.
+
+    Args:
+        cache (dict): Cache entries keyed by fingerprint
+        key (str): Fingerprint of the new entry
+    """
+    entry = cache[key]
+    same = ("module", "test", "sim")
+    stale = [k for k, e in cache.items() if k != key and
+             all(e.get(f) == entry[f] for f in same)]
+    for k in stale:
+        old = cache.pop(k)
+        paths = [os.path.join(CACHE_DIR, f"{k}.xml"), old.get("coverage")]
+        for path in paths:
+            if path and os.path.exists(path):
+                os.remove(path)
+
+
+def read_verdict(results_file, test):
+    """Read the verdict of a test from a cocotb results file.
+
+    Args:
+        results_file (str): JUnit XML file written by cocotb
+        test (str): Test name
+
+    Returns:
+        bool: True if the test passed, None if it was not found
+    """
+    try:
+        tree = ET.parse(results_file)
+    except (FileNotFoundError, ET.ParseError):
+        return None
+    for case in tree.iter("testcase"):
+        if case.get("name") == test:
+            return (case.find("failure") is None and
+                    case.find("error") is None)
+    return None
+
+
+def run_test(module, test, seed, sim, key, log_mode):
+    """Run a single test through make.
+
+    Args:
+        module (str): Bench module name
+        test (str): Test name
+        seed (str): Random seed
+        sim (str): Simulator name
+        key (str): Fingerprint used to name the saved coverage file
+        log_mode (str): Testbench logging mode
+
+    Returns:
+        dict: Cache entry with the verdict, runtime and coverage file
+    """
+    results_file = os.path.join(CACHE_DIR, f"{key}.xml")
+    coverage_file = os.path.join(ROOT, "coverage.dat")
+    env = dict(os.environ, COCOTB_RESULTS_FILE=results_file)
+    cmd = ["make", "sim", f"SIM={sim}", f"MODULE={module}",
+           f"TESTCASE={test}", f"RANDOM_SEED={seed}",
+           f"PM32_LOG_MODE={log_mode}"]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    start = time.time()
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, check=False)
+    runtime = time.time() - start
+    verdict = read_verdict(results_file, test)
+    if verdict is None:
+        verdict = False
+    elif proc.returncode != 0:
+        verdict = False
+    coverage = None
+    if (os.path.exists(coverage_file) and
+            os.path.getmtime(coverage_file) >= start):
+        coverage = os.path.join(CACHE_DIR, f"{key}.dat")
+        shutil.copyfile(coverage_file, coverage)
+    return {
+        "module": module,
+        "test": test,
+        "seed": seed,
+        "sim": sim,
+        "passed": verdict,
+        "runtime": round(runtime, 3),
+        "coverage": coverage,
+    }
+
+
+def main(argv=None):
+    """Run the incremental regression.
+
+    Args:
+        argv (list): Command line arguments
+
+    Returns:
+        int: Process exit status
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-m", "--module", action="append", choices=BENCHES,
+                        help="bench module to run (default: all)")
+    parser.add_argument("--sim", default=os.environ.get("SIM", "icarus"),
+                        help="simulator (default: $SIM or icarus)")
+    parser.add_argument("--seed", default=os.environ.get("RANDOM_SEED", "1"),
+                        help="random seed (default: $RANDOM_SEED or 1)")
+    parser.add_argument("--log-mode", default="regression",
+                        choices=("debug", "regression"),
+                        help="testbench logging mode (default: regression)")
+    parser.add_argument("--force", action="store_true",
+                        help="run all tests, ignoring cached verdicts")
+    args = parser.parse_args(argv)
+
+    cache = load_cache()
+    version = tool_versions(args.sim)
+    ran = skipped = failed = 0
+    saved = 0.0
+    for module in args.module or BENCHES:
+        for test in discover_tests(module):
+            key = fingerprint(module, test, args.seed, args.sim, version)
+            entry = cache.get(key)
+            if entry is not None and entry["passed"] and not args.force:
+                print(f"SKIP {module}.{test} (unchanged, passed in "
+                      f"{entry['runtime']:.1f}s)")
+                skipped += 1
+                saved += entry["runtime"]
+                continue
+            entry = run_test(module, test, args.seed, args.sim, key,
+                             args.log_mode)
+            cache[key] = entry
+            prune_cache(cache, key)
+            save_cache(cache)
+            ran += 1
+            status = "PASS" if entry["passed"] else "FAIL"
+            print(f"{status} {module}.{test} ({entry['runtime']:.1f}s)")
+            if not entry["passed"]:
+                failed += 1
+
+    print(f"Ran {ran}, skipped {skipped} ({saved:.1f}s saved), "
+          f"failed {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
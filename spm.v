@@ -10,27 +10,37 @@
 `timescale    1ns/1ps
 `default_nettype    none
 
-module spm #(parameter SIZE = 32)(
+module spm #(parameter SIZE = 32, parameter LANE = SIZE)(
     input  logic              clk,
     input  logic              rst,
-    input  logic              y,
+    input  logic              clr,  // synchronous clear before a new operation
+    input  logic [SIZE-1:0]   y,    // multiplier bit of each cell
+    input  logic [SIZE-1:0]   brk,  // cell is the MSB of a lane, break the chain
     input  logic [SIZE-1:0]   x,
-    output logic              p
+    output logic [SIZE-1:0]   p     // cell outputs, p[i] is the product bit
+                                    // of a lane starting at cell i
 );
-    logic [SIZE-1:1]     pp;
-    logic [SIZE-1:0]     xy;
+    logic [SIZE-2:0]     csum;
 
     genvar i;
 
-    CSADD csa0 (.clk(clk), .rst(rst), .x(x[0]&y), .y(pp[1]), .sum(p));
-
+    // Cells at multiples of LANE can be the MSB of a lane: they get a
+    // TCMP of their own, which replaces the CSADD when brk is set
     generate
-        for(i=1; i<SIZE-1; i++) begin : gen_csa
-            CSADD csa (.clk(clk), .rst(rst), .x(x[i]&y), .y(pp[i+1]), .sum(pp[i]));
+        for(i=0; i<SIZE-1; i++) begin : gen_csa
+            CSADD csa (.clk(clk), .rst(rst), .clr(clr), .x(x[i]&y[i]), .y(p[i+1]), .sum(csum[i]));
+            if(((i+1) % LANE) == 0) begin : gen_brk
+                logic tsum;
+                TCMP tcmp (.clk(clk), .rst(rst), .clr(clr), .a(x[i]&y[i]), .s(tsum));
+                assign p[i] = brk[i] ? tsum : csum[i];
+            end
+            else begin : gen_chain
+                assign p[i] = csum[i];
+            end
         end
     endgenerate
 
-    TCMP tcmp (.clk(clk), .rst(rst), .a(x[SIZE-1]&y), .s(pp[SIZE-1]));
+    TCMP tcmp (.clk(clk), .rst(rst), .clr(clr), .a(x[SIZE-1]&y[SIZE-1]), .s(p[SIZE-1]));
 
 endmodule
 
@@ -39,6 +49,7 @@ endmodule
 module CSADD(
     input  logic  clk,
     input  logic  rst,
+    input  logic  clr,
     input  logic  x,
     input  logic  y,
     output logic  sum
@@ -60,6 +71,10 @@ module CSADD(
             sum <= 1'b0;
             sc <= 1'b0;
         end
+        else if (clr) begin
+            sum <= 1'b0;
+            sc <= 1'b0;
+        end
         else begin
             sum <= hsum2;
             sc <= hco1 ^ hco2;
@@ -71,6 +86,7 @@ endmodule
 module TCMP (
     input  logic  clk,
     input  logic  rst,
+    input  logic  clr,
     input  logic  a,
     output logic  s
 );
@@ -82,9 +98,13 @@ module TCMP (
             s <= 1'b0;
             z <= 1'b0;
         end
+        else if (clr) begin
+            s <= 1'b0;
+            z <= 1'b0;
+        end
         else begin
             z <= a | z;
-            s <= a & ~z;  // Pulse only on first occurrence of a=1
+            s <= a ^ z;  // Pass bits up to the first a=1, then invert
         end
     end
 endmodule
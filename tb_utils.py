@@ -2,12 +2,16 @@
 
 import enum
 import logging
+import os
+import random
+from collections import Counter, deque
 
 import cocotb
 import pyuvm
 from cocotb.clock import Clock
 from cocotb.queue import Queue, QueueEmpty
-from cocotb.triggers import ClockCycles, RisingEdge
+from cocotb.triggers import ClockCycles, Event, RisingEdge
+from cocotb.utils import get_sim_time
 
 
 @enum.unique
@@ -15,36 +19,194 @@ class Ops(enum.IntEnum):
     """Legal operations for the Design."""
 
     MUL = 1
+    MAC = 2  # multiply and add the product to the accumulator
+    ACC = 3  # read out and clear the accumulator
+    MUL2X16 = 4  # two independent 16-bit signed lanes
+    MUL4X8 = 5  # four independent 8-bit signed lanes
 
 
-def DutPrediction(A, B, op):
+# Width of the Design accumulator read out by Ops.ACC
+ACC_WIDTH = 80
+
+# Operand lane width of the packed operations. Lane i of the result holds
+# the product of lane i of both operands and is twice as wide.
+LANE_WIDTH = {Ops.MUL2X16: 16, Ops.MUL4X8: 8}
+
+
+def to_signed(val, bits=32):
+    """Convert an unsigned value to a signed value.
+
+    Args:
+        val (int): Unsigned value
+        bits (int): Width of the value
+
+    Returns:
+        int: Two's complement interpretation of val
+    """
+    val &= (1 << bits) - 1
+    return val if val < (1 << (bits - 1)) else val - (1 << bits)
+
+
+def split_lanes(val, width, total=32):
+    """Split a packed value into signed lanes.
+
+    Args:
+        val (int): Packed value
+        width (int): Lane width
+        total (int): Width of the packed value
+
+    Returns:
+        list: Signed lane values, lane 0 first
+    """
+    return [to_signed(val >> shift, width) for shift in range(0, total, width)]
+
+
+def lane_corner_operand(width=32):
+    """Generate a 32-bit operand with a sign corner case in every lane.
+
+    Args:
+        width (int): Lane width
+
+    Returns:
+        int: Unsigned 32-bit operand
+    """
+    corners = [0, 1, (1 << width) - 1, 1 << (width - 1),
+               (1 << (width - 1)) - 1]
+    val = 0
+    for shift in range(0, 32, width):
+        lane = random.choice(corners + [random.getrandbits(width)])
+        val |= lane << shift
+    return val
+
+
+def DutPrediction(A, B, op, acc=0):
     """Python model of the Design.
 
     Args:
         A (int): First operand (32-bit)
         B (int): Second operand (32-bit)
         op (Ops): Operation to perform
+        acc (int): Accumulator value, used by Ops.ACC
 
     Returns:
         int: Result of the operation
     """
     assert isinstance(op, Ops), "The Design op must be of type Ops"
 
-    def to_signed(val):
-        """Convert unsigned to signed 32-bit value."""
-        return val if val < 0x80000000 else val - 0x100000000
-
     A_s = to_signed(A)
     B_s = to_signed(B)
-    if op == Ops.MUL:
+    if op in (Ops.MUL, Ops.MAC):
         result = A_s * B_s
+    elif op == Ops.ACC:
+        result = acc
+    elif op in LANE_WIDTH:
+        width = LANE_WIDTH[op]
+        packed = 0
+        lanes = zip(split_lanes(A, width), split_lanes(B, width))
+        for i, (a, b) in enumerate(lanes):
+            packed |= ((a * b) & ((1 << 2 * width) - 1)) << (2 * width * i)
+        result = to_signed(packed, 64)
     return result
 
 
+def lane_errors(actual, predicted, op):
+    """Describe the lanes of a packed result that do not match.
+
+    Args:
+        actual (int): Result from the Design
+        predicted (int): Predicted result
+        op (Ops): Operation performed
+
+    Returns:
+        str: One entry per mismatching lane, empty for unpacked operations
+    """
+    if op not in LANE_WIDTH:
+        return ""
+    width = 2 * LANE_WIDTH[op]
+    lanes = zip(split_lanes(actual, width, 64),
+                split_lanes(predicted, width, 64))
+    return ", ".join(f"lane {i}: {a} expected {p}"
+                     for i, (a, p) in enumerate(lanes) if a != p)
+
+
+class DutModel():
+    """Python model of the Design that keeps the accumulator state."""
+
+    def __init__(self):
+        """Initialize the model with a cleared accumulator."""
+        self.acc = 0
+
+    def predict(self, A, B, op):
+        """Predict the result of an operation and update the accumulator.
+
+        Args:
+            A (int): First operand (32-bit)
+            B (int): Second operand (32-bit)
+            op (Ops): Operation to perform
+
+        Returns:
+            int: Result of the operation
+        """
+        result = DutPrediction(A, B, op, self.acc)
+        if op == Ops.MAC:
+            self.acc = to_signed(self.acc + result, ACC_WIDTH)
+        elif op == Ops.ACC:
+            self.acc = 0
+        return result
+
+
+# Logging mode, selected with the PM32_LOG_MODE environment variable:
+#   debug       every transaction and monitored datum is logged (default)
+#   regression  failures in full, one in PM32_LOG_SAMPLE passes and counters
+LOG_MODES = ("debug", "regression")
+LOG_MODE = os.environ.get("PM32_LOG_MODE", "debug")
+if LOG_MODE not in LOG_MODES:
+    raise ValueError(
+        f"PM32_LOG_MODE must be one of {', '.join(LOG_MODES)}, "
+        f"not {LOG_MODE!r}")
+LOG_SAMPLE = int(os.environ.get("PM32_LOG_SAMPLE", 1000))
+LOG_LEVEL = logging.DEBUG if LOG_MODE == "debug" else logging.INFO
+
 # Edit: Setting up logging using the logger variable, default on DEBUG mode
 logging.basicConfig(level=logging.NOTSET)
 logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
+logger.setLevel(LOG_LEVEL)
+
+
+class CheckLog():
+    """Pass/fail logging for scoreboards.
+
+    Messages are formatted lazily, logging style. Failures are always
+    logged. In regression mode passes are counted and only the first of
+    every LOG_SAMPLE is logged (0 logs none).
+    """
+
+    def __init__(self, log=logger):
+        """Initialize the counters.
+
+        Args:
+            log (Logger): Logger to write to
+        """
+        self.log = log
+        self.sample = 1 if LOG_MODE == "debug" else LOG_SAMPLE
+        self.passed = 0
+        self.failed = 0
+
+    def log_pass(self, msg, *args):
+        """Count a passing check and log it if it is sampled."""
+        self.passed += 1
+        if self.sample and (self.passed - 1) % self.sample == 0:
+            self.log.info(msg, *args)
+
+    def log_fail(self, msg, *args):
+        """Count a failing check and log it."""
+        self.failed += 1
+        self.log.error(msg, *args)
+
+    def summary(self):
+        """Log the pass and fail counters."""
+        self.log.info("Checked %d transactions: %d passed, %d failed",
+                      self.passed + self.failed, self.passed, self.failed)
 
 
 def get_int(signal):
@@ -63,6 +225,195 @@ def get_int(signal):
     return int_val
 
 
+# Cycles from the clock edge that samples start to the first edge that samples
+# done: the serial cycles (64, or 32/16 for packed lanes) plus the
+# RUNNING -> DONE transition and the edge that observes the registered done
+# flag; ACC passes through READ. Override the MUL/MAC bound with
+# PM32_MAX_LATENCY and the bound of any op with PM32_MAX_LATENCY_<op name>.
+MAX_LATENCY_CYCLES = int(os.environ.get("PM32_MAX_LATENCY", 66))
+MAX_LATENCY = {
+    op: int(os.environ.get(f"PM32_MAX_LATENCY_{op.name}", cycles))
+    for op, cycles in ((Ops.MUL, MAX_LATENCY_CYCLES),
+                       (Ops.MAC, MAX_LATENCY_CYCLES),
+                       (Ops.ACC, 2),
+                       (Ops.MUL2X16, 34),
+                       (Ops.MUL4X8, 18))
+}
+
+
+def hist_summary(hist):
+    """Summarize a histogram of cycle counts.
+
+    Args:
+        hist (Counter): Occurrences keyed by cycle count
+
+    Returns:
+        str: min/mean/max summary followed by the full histogram
+    """
+    if not hist:
+        return "no samples"
+    total = sum(hist.values())
+    mean = sum(k * n for k, n in hist.items()) / total
+    return (f"min {min(hist)} mean {mean:.1f} max {max(hist)} "
+            f"over {total} samples {dict(sorted(hist.items()))}")
+
+
+class LatencyMonitor():
+    """Latency and throughput monitor for the start/done handshake."""
+
+    def __init__(self, dut, max_latency=None):
+        """Initialize the monitor.
+
+        Args:
+            dut: Device under test instance
+            max_latency (dict): Largest acceptable start to done latency
+                of each op, MAX_LATENCY by default
+        """
+        self.dut = dut
+        self.max_latency = dict(MAX_LATENCY if max_latency is None
+                                else max_latency)
+        self.clear()
+
+    def clear(self):
+        """Discard all collected statistics."""
+        self.latency_hist = {op: Counter() for op in Ops}
+        self.gap_hist = Counter()
+        self.violations = []
+        self.cycle = 0
+        self.completed = 0
+        self.first_start = None
+        self.last_done = None
+        self.start_cycle = None
+        self.start_op = None
+
+    async def run(self):
+        """Timestamp start and done rising edges on every clock."""
+        prev_start = 0
+        prev_done = 0
+        while True:
+            await RisingEdge(self.dut.clk)
+            self.cycle += 1
+            start = get_int(self.dut.start)
+            done = get_int(self.dut.done)
+            if done == 1 and prev_done == 0:
+                self.on_done()
+            if start == 1 and prev_start == 0:
+                self.on_start()
+            prev_start = start
+            prev_done = done
+
+    def on_start(self):
+        """Record the issue of an operation and its op."""
+        if self.first_start is None:
+            self.first_start = self.cycle
+        if self.last_done is not None:
+            self.gap_hist[self.cycle - self.last_done] += 1
+        self.start_cycle = self.cycle
+        # op is sampled with start; 0 behaves as MUL in the Design
+        op = get_int(self.dut.op)
+        self.start_op = Ops(op) if op in set(Ops) else Ops.MUL
+
+    def on_done(self):
+        """Record the completion of an operation."""
+        if self.start_cycle is None:
+            return
+        latency = self.cycle - self.start_cycle
+        self.latency_hist[self.start_op][latency] += 1
+        if latency > self.max_latency[self.start_op]:
+            self.violations.append(
+                (self.start_cycle, self.start_op, latency))
+        self.completed += 1
+        self.last_done = self.cycle
+        self.start_cycle = None
+
+    def ops_per_cycle(self):
+        """Sustained throughput from the first issue to the last completion.
+
+        Returns:
+            float: Completed operations per clock cycle
+        """
+        if self.completed == 0:
+            return 0.0
+        return self.completed / (self.last_done - self.first_start)
+
+    def check(self):
+        """Report latency statistics and check the latency bound of each op.
+
+        Returns:
+            bool: True if no operation exceeded the latency bound of its op
+        """
+        for op, hist in self.latency_hist.items():
+            if hist:
+                logger.info(f"Latency {op.name} (bound "
+                            f"{self.max_latency[op]}): {hist_summary(hist)}")
+        logger.info(f"Issue gap: {hist_summary(self.gap_hist)}")
+        logger.info(f"Throughput: {self.ops_per_cycle():.4f} ops/cycle")
+        for start_cycle, op, latency in self.violations:
+            logger.error(
+                f"Latency violation: {op.name} started at cycle "
+                f"{start_cycle} took {latency} cycles, "
+                f"bound is {self.max_latency[op]}")
+        return not self.violations
+
+
+class Transaction():
+    """Awaitable handle for an operation sent through the DutBfm.
+
+    Awaiting the handle waits for the operation to complete and returns
+    the product.
+    """
+
+    def __init__(self, txn_id, mc, mp, op):
+        """Initialize the handle.
+
+        Args:
+            txn_id (int): Transaction ID, unique within a simulation
+            mc (int): First operand
+            mp (int): Second operand
+            op (int): Operation code
+        """
+        self.txn_id = txn_id
+        self.mc = mc
+        self.mp = mp
+        self.op = op
+        self.result = None
+        self.latency = None
+        self.start_time = None
+        self.done = False
+        self.done_event = Event()
+
+    def complete(self, result, latency=None):
+        """Resolve the handle.
+
+        Args:
+            result (int): Value of p when done was asserted
+            latency (int): Cycles from start to done, if known
+        """
+        self.result = result
+        self.latency = latency
+        self.done = True
+        self.done_event.set()
+
+    async def wait(self):
+        """Wait for the operation to complete.
+
+        Returns:
+            int: Result value
+        """
+        if not self.done:
+            await self.done_event.wait()
+        return self.result
+
+    def __await__(self):
+        """Make the handle awaitable."""
+        return self.wait().__await__()
+
+    def __str__(self):
+        """String representation of the transaction."""
+        return (f"txn {self.txn_id}: 0x{self.mc:02x} "
+                f"{Ops(self.op).name} 0x{self.mp:02x}")
+
+
 class DutBfm(metaclass=pyuvm.Singleton):
     """Bus Functional Model for PM32 DUT communication."""
 
@@ -72,10 +423,23 @@ class DutBfm(metaclass=pyuvm.Singleton):
         self.cmd_driver_queue = Queue(maxsize=1)
         self.cmd_mon_queue = Queue(maxsize=0)
         self.result_mon_queue = Queue(maxsize=0)
+        # Set by monitors that consume get_cmd/get_result, so the monitor
+        # queues are only filled when something drains them
+        self.monitor_queues = False
+        # op of the last command seen by cmd_mon
+        self.mon_op = Ops.MUL
+        self.clock_period = 1  # ns
+        self.next_txn_id = 0
+        self.last_txn = None
+        self.in_flight = deque()
+        self.latency_mon = LatencyMonitor(self.dut)
 
     async def reset(self):
         """Reset the DUT and initialize signals."""
-        cocotb.start_soon(Clock(self.dut.clk, 1, units="ns").start())
+        cocotb.start_soon(
+            Clock(self.dut.clk, self.clock_period, units="ns").start())
+        self.in_flight.clear()
+        self.last_txn = None
         self.dut.rst.value = 1  # active high reset
         self.dut.mc.value = 0
         self.dut.mp.value = 0
@@ -86,14 +450,31 @@ class DutBfm(metaclass=pyuvm.Singleton):
         await RisingEdge(self.dut.clk)
 
     async def result_mon(self):
-        """Monitor the result bus for completed operations."""
+        """Monitor the result bus for completed operations.
+
+        Results are signed: 64 bits for products and ACC_WIDTH bits for
+        accumulator read outs.
+        """
         prev_done = 0
         while True:
             await RisingEdge(self.dut.clk)
             done = get_int(self.dut.done)
             if prev_done == 0 and done == 1:
-                result = get_int(self.dut.p)
-                self.result_mon_queue.put_nowait(result)
+                # Decode with the op of the completing operation
+                txn = self.in_flight.popleft() if self.in_flight else None
+                op = txn.op if txn is not None else self.mon_op
+                if op == Ops.ACC:
+                    result = to_signed(
+                        (get_int(self.dut.p_hi) << 64) | get_int(self.dut.p),
+                        ACC_WIDTH)
+                else:
+                    result = to_signed(get_int(self.dut.p), 64)
+                if self.monitor_queues:
+                    self.result_mon_queue.put_nowait(result)
+                if txn is not None:
+                    latency = round((get_sim_time(units="ns") - txn.start_time)
+                                    / self.clock_period)
+                    txn.complete(result, latency)
             prev_done = done
 
     async def cmd_mon(self):
@@ -106,7 +487,9 @@ class DutBfm(metaclass=pyuvm.Singleton):
                 cmd_tuple = (get_int(self.dut.mc),
                              get_int(self.dut.mp),
                              get_int(self.dut.op))
-                self.cmd_mon_queue.put_nowait(cmd_tuple)
+                self.mon_op = cmd_tuple[2]
+                if self.monitor_queues:
+                    self.cmd_mon_queue.put_nowait(cmd_tuple)
             prev_start = start
 
     async def cmd_driver(self):
@@ -119,29 +502,39 @@ class DutBfm(metaclass=pyuvm.Singleton):
             await RisingEdge(self.dut.clk)
             st = get_int(self.dut.start)
             dn = get_int(self.dut.done)
-            # Drive commands to the Design when start and done are 0
-            if st == 0 and dn == 0:
+            # The Design samples start on this edge, so drop it again
+            if st == 1:
+                self.dut.start.value = 0
+                self.in_flight[-1].start_time = get_sim_time(units="ns")
+            # Drive the next command once the previous one is done. done is
+            # checked here as well, since result_mon may only retire the
+            # transaction after this coroutine has run on the same edge.
+            elif not self.in_flight or (
+                    dn == 1 and len(self.in_flight) == 1 and
+                    self.in_flight[0].start_time is not None):
                 try:
-                    (aa, bb, op) = self.cmd_driver_queue.get_nowait()
-                    self.dut.mc.value = aa
-                    self.dut.mp.value = bb
-                    self.dut.op.value = op
-                    self.dut.start.value = 1
+                    txn = self.cmd_driver_queue.get_nowait()
                 except QueueEmpty:
                     continue
-            # If start is 1 check done
-            elif st == 1 and dn == 0:
-                self.dut.start.value = 0  # testing
+                self.dut.mc.value = txn.mc
+                self.dut.mp.value = txn.mp
+                self.dut.op.value = txn.op
+                self.dut.start.value = 1
+                self.in_flight.append(txn)
 
     def start_tasks(self):
         """Start the BFM coroutines."""
         cocotb.start_soon(self.cmd_driver())
         cocotb.start_soon(self.cmd_mon())
         cocotb.start_soon(self.result_mon())
+        self.latency_mon.clear()
+        cocotb.start_soon(self.latency_mon.run())
 
     async def get_cmd(self):
         """Get the next command from the monitor queue.
 
+        Only filled while monitor_queues is set.
+
         Returns:
             tuple: Command tuple (mc, mp, op)
         """
@@ -151,6 +544,8 @@ class DutBfm(metaclass=pyuvm.Singleton):
     async def get_result(self):
         """Get the next result from the monitor queue.
 
+        Only filled while monitor_queues is set.
+
         Returns:
             int: Result value
         """
@@ -160,10 +555,24 @@ class DutBfm(metaclass=pyuvm.Singleton):
     async def send_op(self, aa, bb, op):
         """Send an operation to the DUT.
 
+        Returns once the operation is queued. Await the returned handle
+        to get the result.
+
         Args:
             aa (int): First operand
             bb (int): Second operand
             op (int): Operation code
+
+        Returns:
+            Transaction: Handle that resolves to the result
         """
-        command_tuple = (aa, bb, op)
-        await self.cmd_driver_queue.put(command_tuple)
+        txn = Transaction(self.next_txn_id, aa, bb, op)
+        self.next_txn_id += 1
+        self.last_txn = txn
+        await self.cmd_driver_queue.put(txn)
+        return txn
+
+    async def drain(self):
+        """Wait until every operation sent so far has completed."""
+        if self.last_txn is not None:
+            await self.last_txn
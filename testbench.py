@@ -9,7 +9,9 @@ from pyuvm import *
 
 # All testbenches use tb_utils, so store it in a central
 # place and add its path to the sys path so we can import it
-from tb_utils import DutBfm, Ops, DutPrediction  # noqa: E402
+from tb_utils import (DutBfm, Ops, DutModel, LANE_WIDTH,  # noqa: E402
+                      CheckLog, LOG_LEVEL, lane_corner_operand,
+                      lane_errors)
 
 
 # # UVM sequences
@@ -47,6 +49,7 @@ class DutEnv(uvm_env):
         self.result_mon = Monitor("result_mon", self, "get_result")
         self.scoreboard = Scoreboard("scoreboard", self)
         self.coverage = Coverage("coverage", self)
+        self.performance = Performance("performance", self)
 
     # Edit: Connecting the sequencer to the driver
     def connect_phase(self):
@@ -91,7 +94,7 @@ class BaseSeq(uvm_sequence):
 
     async def body(self):
         """Execute sequence body with all operations."""
-        for op in list(Ops):
+        for op in self.get_ops():
             cmd_tr = AluSeqItem(
                 "cmd_tr",
                 16,
@@ -102,6 +105,10 @@ class BaseSeq(uvm_sequence):
             self.set_operands(cmd_tr)
             await self.finish_item(cmd_tr)
 
+    def get_ops(self):
+        """Get the operations to send. Override in subclasses."""
+        return list(Ops)
+
     def set_operands(self, tr):
         """Set operands for the transaction. Override in subclasses."""
         pass
@@ -136,6 +143,33 @@ class MinSeq(BaseSeq):
         tr.mp = 0x8000_0000
 
 
+class MacSeq(BaseSeq):
+    """Sequence with a multiply-accumulate stream of signed operands."""
+
+    def get_ops(self):
+        """Send every operation, an 8-term dot product and its read out."""
+        return list(Ops) + [Ops.MAC] * 8 + [Ops.ACC]
+
+    def set_operands(self, tr):
+        """Set random 32-bit operands."""
+        tr.mc = random.randint(0, (2**32 - 1))
+        tr.mp = random.randint(0, (2**32 - 1))
+
+
+class SimdSeq(BaseSeq):
+    """Sequence with sign corner cases in every lane of packed operations."""
+
+    def get_ops(self):
+        """Send every operation, then 8 of each packed operation."""
+        return list(Ops) + [Ops.MUL2X16, Ops.MUL4X8] * 8
+
+    def set_operands(self, tr):
+        """Set operands with a sign corner case in every lane."""
+        width = LANE_WIDTH.get(tr.op, 32)
+        tr.mc = lane_corner_operand(width)
+        tr.mp = lane_corner_operand(width)
+
+
 # ## Starting a sequence in a test
 # ### BaseTest
 
@@ -149,8 +183,9 @@ class BaseTest(uvm_test):
         self.env = DutEnv("env", self)
 
     def end_of_elaboration_phase(self):
-        """Get sequencer reference after elaboration."""
+        """Get sequencer reference and set the component log levels."""
         self.seqr = ConfigDB().get(self, "", "SEQR")
+        self.set_logging_level_hier(LOG_LEVEL)
 
     # Edit: All tests start the sequence
     async def run_phase(self):
@@ -158,7 +193,8 @@ class BaseTest(uvm_test):
         self.raise_objection()
         seq = BaseSeq.create("seq")
         await seq.start(self.seqr)
-        await ClockCycles(cocotb.top.clk, 200)  # to do last transaction
+        await DutBfm().drain()
+        await ClockCycles(cocotb.top.clk, 2)  # let monitors forward results
         self.drop_objection()
 
 
@@ -191,6 +227,24 @@ class MinTest(BaseTest):
         uvm_factory().set_type_override_by_type(BaseSeq, MinSeq)
 
 
+@pyuvm.test()
+class MacTest(BaseTest):
+    """Test with a multiply-accumulate stream."""
+
+    def start_of_simulation_phase(self):
+        """Override sequence type for multiply-accumulate testing."""
+        uvm_factory().set_type_override_by_type(BaseSeq, MacSeq)
+
+
+@pyuvm.test()
+class SimdTest(BaseTest):
+    """Test with packed sub-word operations."""
+
+    def start_of_simulation_phase(self):
+        """Override sequence type for packed operation testing."""
+        uvm_factory().set_type_override_by_type(BaseSeq, SimdSeq)
+
+
 class Coverage(uvm_subscriber):
     """Coverage collector for functional coverage."""
 
@@ -214,6 +268,14 @@ class Coverage(uvm_subscriber):
             assert True
 
 
+class Performance(uvm_component):
+    """Latency and throughput checker."""
+
+    def report_phase(self):
+        """Report latency statistics and check the latency bound."""
+        assert DutBfm().latency_mon.check(), "Latency bound exceeded"
+
+
 class Scoreboard(uvm_component):
     """Scoreboard for checking DUT results."""
 
@@ -225,6 +287,8 @@ class Scoreboard(uvm_component):
         self.result_get_port = uvm_get_port("result_get_port", self)
         self.cmd_export = self.cmd_fifo.analysis_export
         self.result_export = self.result_fifo.analysis_export
+        self.model = DutModel()
+        self.checks = CheckLog(self.logger)
 
     def connect_phase(self):
         """Connect ports to FIFOs."""
@@ -232,25 +296,30 @@ class Scoreboard(uvm_component):
         self.result_get_port.connect(self.result_fifo.get_export)
 
     def check_phase(self):
-        """Check results against predictions."""
+        """Check results against predictions and fail on any mismatch."""
         while self.result_get_port.can_get():
             _, actual_result = self.result_get_port.try_get()
             cmd_success, cmd = self.cmd_get_port.try_get()
             if not cmd_success:
-                self.logger.critical(f"result {actual_result} had no command")
+                self.checks.log_fail("result %s had no command", actual_result)
             else:
                 (A, B, op_numb) = cmd
                 op = Ops(op_numb)
-                predicted_result = DutPrediction(A, B, op)
+                predicted_result = self.model.predict(A, B, op)
                 if predicted_result == actual_result:
-                    self.logger.info(
-                        f"PASSED: 0x{A:02x} {op.name} 0x{B:02x} = "
-                        f"0x{actual_result:04x}")
+                    self.checks.log_pass(
+                        "PASSED: 0x%02x %s 0x%02x = 0x%04x",
+                        A, op.name, B, actual_result)
                 else:
-                    self.logger.error(
-                        f"FAILED: 0x{A:02x} {op.name} 0x{B:02x} = "
-                        f"0x{actual_result:04x} "
-                        f"expected 0x{predicted_result:04x}")
+                    self.checks.log_fail(
+                        "FAILED: 0x%02x %s 0x%02x = 0x%04x expected 0x%04x %s",
+                        A, op.name, B, actual_result, predicted_result,
+                        lane_errors(actual_result, predicted_result, op))
+        while self.cmd_get_port.can_get():
+            _, cmd = self.cmd_get_port.try_get()
+            self.checks.log_fail("command %s had no result", cmd)
+        self.checks.summary()
+        assert self.checks.failed == 0, "Scoreboard found mismatches"
 
 
 class Monitor(uvm_component):
@@ -260,6 +329,7 @@ class Monitor(uvm_component):
         """Initialize monitor with method name."""
         super().__init__(name, parent)
         self.bfm = DutBfm()
+        self.bfm.monitor_queues = True
         self.get_method = getattr(self.bfm, method_name)
 
     def build_phase(self):
@@ -270,5 +340,5 @@ class Monitor(uvm_component):
         """Monitor interface and write to analysis port."""
         while True:
             datum = await self.get_method()
-            self.logger.debug(f"MONITORED {datum}")
+            self.logger.debug("MONITORED %s", datum)
             self.ap.write(datum)
@@ -4,25 +4,33 @@ import random
 
 import cocotb
 
-from tb_utils import DutBfm, DutPrediction, Ops, logger
+from tb_utils import (CheckLog, DutBfm, DutModel, LANE_WIDTH, Ops,
+                      lane_corner_operand, lane_errors, logger)
 
 
 class BaseTester():
     """Base class for all testers with common behavior."""
 
     async def execute(self):
-        """Execute the test with different operations."""
+        """Execute the test with different operations.
+
+        Returns:
+            list: Completed transactions
+        """
         self.bfm = DutBfm()
-        ops = list(Ops)
-        for op in ops:
-            aa, bb = self.get_operands()
-            await self.bfm.send_op(aa, bb, op)
-        # send two dummy operations to allow
-        # last real operation to complete
-        await self.bfm.send_op(0, 0, 1)
-        await self.bfm.send_op(0, 0, 1)
-
-    def get_operands(self):
+        txns = []
+        for op in self.get_ops():
+            aa, bb = self.get_operands(op)
+            txns.append(await self.bfm.send_op(aa, bb, op))
+        for txn in txns:
+            await txn
+        return txns
+
+    def get_ops(self):
+        """Get the operations to send. Override in subclasses."""
+        return list(Ops)
+
+    def get_operands(self, op):
         """Get operands for testing. Override in subclasses."""
         raise NotImplementedError("Subclasses must implement get_operands()")
 
@@ -30,7 +38,7 @@ class BaseTester():
 class RandomTester(BaseTester):
     """Tester that uses random operands."""
 
-    def get_operands(self):
+    def get_operands(self, op):
         """Generate random operands."""
         return random.randint(0, 255), random.randint(0, 255)
 
@@ -38,55 +46,72 @@ class RandomTester(BaseTester):
 class MaxTester(BaseTester):
     """Tester that uses maximum operands."""
 
-    def get_operands(self):
+    def get_operands(self, op):
         """Generate maximum operands."""
         return 0xFF, 0xFF
 
 
+class MacTester(BaseTester):
+    """Tester that sends a multiply-accumulate stream."""
+
+    def get_ops(self):
+        """Send every operation, an 8-term dot product and its read out."""
+        return list(Ops) + [Ops.MAC] * 8 + [Ops.ACC]
+
+    def get_operands(self, op):
+        """Generate random 32-bit operands."""
+        return random.randint(0, 2**32 - 1), random.randint(0, 2**32 - 1)
+
+
+class SimdTester(BaseTester):
+    """Tester that sends packed sub-word operations."""
+
+    def get_ops(self):
+        """Send every operation, then 8 of each packed operation."""
+        return list(Ops) + [Ops.MUL2X16, Ops.MUL4X8] * 8
+
+    def get_operands(self, op):
+        """Generate operands with a sign corner case in every lane."""
+        width = LANE_WIDTH.get(op, 32)
+        return lane_corner_operand(width), lane_corner_operand(width)
+
+
 class Scoreboard():
     """Scoreboard for collecting and checking test results."""
 
     def __init__(self):
         """Initialize the scoreboard."""
-        self.bfm = DutBfm()
-        self.cmds = []
-        self.results = []
+        self.model = DutModel()
+        self.checks = CheckLog()
         self.cvg = set()
 
-    async def get_cmds(self):
-        """Collect commands from BFM."""
-        while True:
-            cmd = await self.bfm.get_cmd()
-            self.cmds.append(cmd)
-
-    async def get_results(self):
-        """Collect results from BFM."""
-        while True:
-            result = await self.bfm.get_result()
-            self.results.append(result)
-
-    def start_tasks(self):
-        """Launch data-gathering tasks."""
-        cocotb.start_soon(self.get_cmds())
-        cocotb.start_soon(self.get_results())
-
-    def check_results(self):
-        """Check results against predictions and coverage."""
+    def check_results(self, txns):
+        """Check results against predictions and coverage.
+
+        Args:
+            txns (list): Completed transactions
+
+        Returns:
+            bool: True if all results and coverage are correct
+        """
         passed = True
-        for cmd in self.cmds:
-            aa, bb, op_int = cmd
-            op = Ops(op_int)
+        for txn in txns:
+            aa, bb = txn.mc, txn.mp
+            op = Ops(txn.op)
             self.cvg.add(op)
-            actual = self.results.pop(0)
-            prediction = DutPrediction(aa, bb, op)
+            actual = txn.result
+            prediction = self.model.predict(aa, bb, op)
             if actual == prediction:
-                logger.info(
-                    f"PASSED: {aa:02x} {op.name} {bb:02x} = {actual:04x}")
+                self.checks.log_pass(
+                    "PASSED: txn %d: %02x %s %02x = %04x in %s cycles",
+                    txn.txn_id, aa, op.name, bb, actual, txn.latency)
             else:
                 passed = False
-                logger.error(
-                    f"FAILED: {aa:02x} {op.name} {bb:02x} = {actual:04x}"
-                    f" - predicted {prediction:04x}")
+                self.checks.log_fail(
+                    "FAILED: txn %d: %02x %s %02x = %04x - predicted %04x %s",
+                    txn.txn_id, aa, op.name, bb, actual, prediction,
+                    lane_errors(actual, prediction, op))
+        self.checks.summary()
 
         # Check functional coverage
         if len(set(Ops) - self.cvg) > 0:
@@ -111,12 +136,12 @@ async def execute_test(tester_class):
     scoreboard = Scoreboard()
     await bfm.reset()
     bfm.start_tasks()
-    scoreboard.start_tasks()
 
     # Execute the tester
     tester = tester_class()
-    await tester.execute()
-    passed = scoreboard.check_results()
+    txns = await tester.execute()
+    passed = scoreboard.check_results(txns)
+    passed = bfm.latency_mon.check() and passed
     return passed
 
 
@@ -132,3 +157,17 @@ async def max_test(_):
     """Test with maximum operands."""
     passed = await execute_test(MaxTester)
     assert passed
+
+
+@cocotb.test()
+async def mac_test(_):
+    """Test with a multiply-accumulate stream."""
+    passed = await execute_test(MacTester)
+    assert passed
+
+
+@cocotb.test()
+async def simd_test(_):
+    """Test with packed sub-word operations."""
+    passed = await execute_test(SimdTester)
+    assert passed